@@ -4,24 +4,28 @@ Initialize MinIO bucket for MLflow
 """
 import boto3
 import time
+import urllib.request
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def init_minio_bucket():
+MINIO_HEALTH_URL = 'http://localhost:9000/minio/health/live'
+
+def _make_client():
+    """Create S3 client for MinIO"""
+    return boto3.client(
+        's3',
+        endpoint_url='http://localhost:9000',
+        aws_access_key_id='minioadmin',
+        aws_secret_access_key='minioadmin',
+        region_name='us-east-1'
+    )
+
+def init_minio_bucket(s3_client):
     """Initialize MinIO bucket for MLflow"""
     try:
-        # Create S3 client for MinIO
-        s3_client = boto3.client(
-            's3',
-            endpoint_url='http://localhost:9000',
-            aws_access_key_id='minioadmin',
-            aws_secret_access_key='minioadmin',
-            region_name='us-east-1'
-        )
-        
         # Check if bucket exists
         try:
             s3_client.head_bucket(Bucket='mlflow')
@@ -45,29 +49,23 @@ def wait_for_minio():
     
     while attempt < max_attempts:
         try:
-            s3_client = boto3.client(
-                's3',
-                endpoint_url='http://localhost:9000',
-                aws_access_key_id='minioadmin',
-                aws_secret_access_key='minioadmin',
-                region_name='us-east-1'
-            )
-            
-            # Try to list buckets
-            s3_client.list_buckets()
+            # Hit MinIO's liveness endpoint rather than a full S3 call
+            with urllib.request.urlopen(MINIO_HEALTH_URL, timeout=1):
+                pass
             logger.info("✅ MinIO is ready!")
             return True
             
         except Exception as e:
+            logger.info(f"⏳ MinIO not ready yet (attempt {attempt + 1}/{max_attempts})")
+            # Exponential backoff, capped so we still notice MinIO quickly
+            time.sleep(min(0.25 * 2 ** attempt, 2.0))
             attempt += 1
-            logger.info(f"⏳ MinIO not ready yet (attempt {attempt}/{max_attempts})")
-            time.sleep(2)
     
     logger.error("❌ MinIO failed to start within expected time")
     return False
 
 if __name__ == "__main__":
     if wait_for_minio():
-        init_minio_bucket()
+        init_minio_bucket(_make_client())
     else:
         logger.error("Failed to initialize MinIO")
@@ -3,19 +3,27 @@
 Launch script for Open WebUI Docker container
 """
 import os
+import shutil
 import subprocess
 import sys
 import time
+import urllib.request
+
+# Resolve executables once instead of searching PATH on every call
+DOCKER = shutil.which("docker") or "docker"
+DOCKER_COMPOSE = shutil.which("docker-compose") or "docker-compose"
+
+OPENWEBUI_HEALTH_URL = "http://localhost:8080/health"
 
 def run_command(command, description, check_output=False):
-    """Run a command and handle errors"""
+    """Run a command (argv list) and handle errors"""
     print(f"🔄 {description}...")
     try:
         if check_output:
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+            result = subprocess.run(command, check=True, capture_output=True, text=True)
             return result.stdout.strip()
         else:
-            subprocess.run(command, shell=True, check=True)
+            subprocess.run(command, check=True)
             print(f"✅ {description} completed successfully")
             return True
     except subprocess.CalledProcessError as e:
@@ -23,12 +31,19 @@ def run_command(command, description, check_output=False):
         if e.stderr:
             print(f"Error output: {e.stderr}")
         return False
+    except OSError as e:
+        print(f"❌ {description} failed: {e}")
+        return False
 
 def check_container_status():
     """Check if Open WebUI container is running"""
     try:
-        result = subprocess.run("docker ps --filter name=open-webui --format '{{.Status}}'", 
-                              shell=True, capture_output=True, text=True)
+        # Let docker do the filtering; any container ID on stdout means running
+        result = subprocess.run([DOCKER, "ps", "-q", "--filter", "name=^open-webui$",
+                                 "--filter", "status=running"],
+                              capture_output=True, check=False)
+        if result.returncode != 0:
+            return "error"
         if result.stdout.strip():
             return "running"
         else:
@@ -36,6 +51,28 @@ def check_container_status():
     except:
         return "error"
 
+def wait_for_health(container="open-webui", timeout=60):
+    """Wait until the container reports healthy or answers on /health"""
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while time.monotonic() < deadline:
+        try:
+            result = subprocess.run([DOCKER, "inspect", "--format", "{{.State.Health.Status}}", container],
+                                  capture_output=True)
+            if result.stdout == b"healthy\n":
+                return True
+        except OSError:
+            pass
+        # Containers without a Docker healthcheck: ask the app directly
+        try:
+            with urllib.request.urlopen(OPENWEBUI_HEALTH_URL, timeout=0.5):
+                return True
+        except Exception:
+            pass
+        time.sleep(min(0.5 * 2 ** attempt, 2.0))
+        attempt += 1
+    return False
+
 def start_openwebui():
     """Start Open WebUI using Docker Compose"""
     print("🚀 Starting Open WebUI with Monitoring...")
@@ -47,12 +84,13 @@ def start_openwebui():
         return False
     
     # Start the container
-    if not run_command("docker-compose up -d", "Starting Open WebUI and monitoring services"):
+    if not run_command([DOCKER_COMPOSE, "up", "-d"], "Starting Open WebUI and monitoring services"):
         return False
     
     # Wait for containers to be ready
     print("⏳ Waiting for services to start...")
-    time.sleep(15)
+    if not wait_for_health():
+        print("⚠️  Open WebUI did not report healthy within 60 seconds")
     
     # Check status
     status = check_container_status()
@@ -79,12 +117,12 @@ def start_openwebui():
 def stop_openwebui():
     """Stop Open WebUI container"""
     print("🛑 Stopping Open WebUI...")
-    return run_command("docker-compose down", "Stopping Open WebUI container")
+    return run_command([DOCKER_COMPOSE, "down"], "Stopping Open WebUI container")
 
 def show_logs():
     """Show Open WebUI container logs"""
     print("📋 Showing Open WebUI logs...")
-    return run_command("docker-compose logs -f open-webui", "Showing logs")
+    return run_command([DOCKER_COMPOSE, "logs", "-f", "open-webui"], "Showing logs")
 
 def show_status():
     """Show container status"""
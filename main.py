@@ -1,14 +1,18 @@
 from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi import Request
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-from openai import OpenAI
+from typing_extensions import TypedDict
+from openai import AsyncOpenAI
 import os
-import json
+import sys
+import orjson
 import asyncio
+import time
+from collections import deque
 from datetime import datetime
+from pathlib import Path
 import logging
 
 # Configure logging
@@ -23,16 +27,27 @@ load_dotenv()
 app = FastAPI(
     title="OpenWebUI - FastAPI",
     description="A FastAPI-based OpenWebUI application with OpenAI integration",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # OpenAI configuration
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 if not os.getenv("OPENAI_API_KEY"):
     logger.warning("OPENAI_API_KEY not found in environment variables")
 
+# Server: libuv event loop and httptools parser (uvloop has no Windows support)
+UVICORN_LOOP = "asyncio" if sys.platform == "win32" else "uvloop"
+
+# Streaming: flush buffered deltas once this many characters accumulate
+# or this many seconds have passed since the last flush
+STREAM_FLUSH_SIZE = 256
+STREAM_FLUSH_INTERVAL = 0.005
+
 # Models
-class ChatMessage(BaseModel):
+# Validated by pydantic but kept as a plain dict, so request.messages can be
+# handed to OpenAI as-is
+class ChatMessage(TypedDict):
     role: str
     content: str
 
@@ -48,106 +63,63 @@ class ChatResponse(BaseModel):
     model: str
     usage: Optional[Dict[str, Any]] = None
 
-# HTML template as Python string
-HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>OpenWebUI - FastAPI</title>
-    <link rel="stylesheet" href="/static/css/style.css">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-</head>
-<body>
-    <div class="container">
-        <header class="header">
-            <h1><i class="fas fa-robot"></i> OpenWebUI</h1>
-            <div class="header-controls">
-                <select id="modelSelect" class="model-select">
-                    <option value="gpt-4o-mini" selected>GPT-4o Mini</option>
-                    <option value="gpt-4o">GPT-4o</option>
-                    <option value="gpt-4-turbo">GPT-4 Turbo</option>
-                    <option value="gpt-3.5-turbo">GPT-3.5 Turbo</option>
-                </select>
-                <button id="clearHistory" class="btn btn-secondary">
-                    <i class="fas fa-trash"></i> Clear History
-                </button>
-            </div>
-        </header>
+# Chat page, served straight from disk
+_HTML_PATH = Path(__file__).parent / "templates" / "index.html"
 
-        <main class="main">
-            <div class="chat-container">
-                <div id="chatMessages" class="chat-messages"></div>
-                
-                <div class="chat-input-container">
-                    <div class="input-wrapper">
-                        <textarea 
-                            id="messageInput" 
-                            class="message-input" 
-                            placeholder="Type your message here..."
-                            rows="3"
-                        ></textarea>
-                        <button id="sendButton" class="btn btn-primary send-btn">
-                            <i class="fas fa-paper-plane"></i>
-                        </button>
-                    </div>
-                    <div class="input-controls">
-                        <label class="temperature-control">
-                            Temperature: <span id="tempValue">0.7</span>
-                            <input type="range" id="temperature" min="0" max="2" step="0.1" value="0.7">
-                        </label>
-                        <label class="max-tokens-control">
-                            Max Tokens: <span id="maxTokensValue">1000</span>
-                            <input type="range" id="maxTokens" min="100" max="4000" step="100" value="1000">
-                        </label>
-                    </div>
-                </div>
-            </div>
-        </main>
+# Static files
+app.mount("/static", StaticFiles(directory="static"), name="static")
 
-        <footer class="footer">
-            <p>Powered by FastAPI & OpenAI</p>
-        </footer>
-    </div>
+# In-memory storage for chat history (in production, use a database).
+# Bounded so the oldest entries are dropped instead of growing forever.
+CHAT_HISTORY_LIMIT = 1000
+chat_history: deque = deque(maxlen=CHAT_HISTORY_LIMIT)
 
-    <script src="/static/js/app.js"></script>
-</body>
-</html>
-"""
+# Models offered in the chat page's model selector
+_ALLOWED_MODELS = ("gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-3.5-turbo")
 
-# Static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Cached /api/models?refresh=1 response, refreshed at most every _MODELS_TTL seconds
+_MODELS_TTL = 300
+_models_cache: Dict[str, Any] = {"ts": 0.0, "data": None}
+_models_lock = asyncio.Lock()
 
-# In-memory storage for chat history (in production, use a database)
-chat_history: List[Dict[str, Any]] = []
+def _models_cache_fresh() -> bool:
+    return (_models_cache["data"] is not None
+            and time.monotonic() - _models_cache["ts"] < _MODELS_TTL)
 
 @app.get("/", response_class=HTMLResponse)
-async def root(request: Request):
+async def root():
     """Main chat interface"""
-    return HTMLResponse(content=HTML_TEMPLATE)
+    return FileResponse(_HTML_PATH, media_type="text/html")
 
 @app.get("/api/models")
-async def get_models():
+async def get_models(refresh: bool = False):
     """Get available OpenAI models"""
-    try:
-        models = openai_client.models.list()
-        return {"models": [model.id for model in models.data]}
-    except Exception as e:
-        logger.error(f"Error fetching models: {e}")
-        return {"models": ["gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-3.5-turbo"]}
+    # The UI only offers these; ask OpenAI only when explicitly requested
+    if not refresh:
+        return {"models": _ALLOWED_MODELS}
+    if _models_cache_fresh():
+        return {"models": _models_cache["data"]}
+    # Only one request refreshes the cache; concurrent misses wait for it
+    async with _models_lock:
+        if _models_cache_fresh():
+            return {"models": _models_cache["data"]}
+        try:
+            models = await openai_client.models.list()
+            _models_cache["data"] = [model.id for model in models.data]
+            _models_cache["ts"] = time.monotonic()
+            return {"models": _models_cache["data"]}
+        except Exception as e:
+            logger.error(f"Error fetching models: {e}")
+            return {"models": _ALLOWED_MODELS}
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """Chat endpoint using OpenAI API"""
     try:
-        # Prepare messages for OpenAI
-        messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
-        
         # Call OpenAI API
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model=request.model,
-            messages=messages,
+            messages=request.messages,
             temperature=request.temperature,
             max_tokens=request.max_tokens,
             stream=request.stream
@@ -181,21 +153,39 @@ async def chat(request: ChatRequest):
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def batch_chunks(response):
+    """Coalesce streamed OpenAI deltas into larger pieces before sending"""
+    loop = asyncio.get_running_loop()
+    buf: List[str] = []
+    buf_size = 0
+    last_flush = loop.time()
+    async for chunk in response:
+        content = chunk.choices[0].delta.content
+        if not content:
+            continue
+        buf.append(content)
+        buf_size += len(content)
+        if buf_size >= STREAM_FLUSH_SIZE or loop.time() - last_flush > STREAM_FLUSH_INTERVAL:
+            yield "".join(buf)
+            buf.clear()
+            buf_size = 0
+            last_flush = loop.time()
+    # Flush whatever is left once the stream ends
+    if buf:
+        yield "".join(buf)
+
 async def stream_response(response):
     """Stream OpenAI response"""
-    for chunk in response:
-        if chunk.choices[0].delta.content:
-            yield chunk.choices[0].delta.content
+    async for text in batch_chunks(response):
+        yield text
 
 @app.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
     """Streaming chat endpoint"""
     try:
-        messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
-        
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model=request.model,
-            messages=messages,
+            messages=request.messages,
             temperature=request.temperature,
             max_tokens=request.max_tokens,
             stream=True
@@ -210,15 +200,25 @@ async def chat_stream(request: ChatRequest):
         logger.error(f"Error in streaming chat: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def stream_history(entries):
+    """Encode chat history as JSON one entry at a time"""
+    yield b'{"history":['
+    for i, entry in enumerate(entries):
+        yield (b"," if i else b"") + orjson.dumps(entry)
+    yield b"]}"
+
 @app.get("/api/chat/history")
 async def get_chat_history():
     """Get chat history"""
-    return {"history": chat_history}
+    # Snapshot so new chats appended mid-stream don't break iteration
+    return StreamingResponse(
+        stream_history(list(chat_history)),
+        media_type="application/json"
+    )
 
 @app.delete("/api/chat/history")
 async def clear_chat_history():
     """Clear chat history"""
-    global chat_history
     chat_history.clear()
     return {"message": "Chat history cleared"}
 
@@ -230,23 +230,19 @@ async def websocket_chat(websocket: WebSocket):
         while True:
             # Receive message from client
             data = await websocket.receive_text()
-            message_data = json.loads(data)
+            message_data = orjson.loads(data)
             
             # Process with OpenAI
-            messages = [{"role": msg["role"], "content": msg["content"]} 
-                       for msg in message_data["messages"]]
-            
-            response = openai_client.chat.completions.create(
+            response = await openai_client.chat.completions.create(
                 model=message_data.get("model", "gpt-4o-mini"),  # Updated default to GPT-4o-mini
-                messages=messages,
+                messages=message_data["messages"],
                 temperature=message_data.get("temperature", 0.7),
                 stream=True
             )
             
-            # Stream response back to client
-            for chunk in response:
-                if chunk.choices[0].delta.content:
-                    await websocket.send_text(chunk.choices[0].delta.content)
+            # Stream response back to client in batches, as UTF-8 binary frames
+            async for text in batch_chunks(response):
+                await websocket.send_bytes(text.encode("utf-8"))
                     
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
@@ -261,4 +257,6 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Worker count follows WEB_CONCURRENCY (default 1). Chat history and the
+    # models cache live in each process, so extra workers don't share them.
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, loop=UVICORN_LOOP, http="httptools")
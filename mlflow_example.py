@@ -7,16 +7,23 @@ import mlflow
 import mlflow.sklearn
 import mlflow.pytorch
 import os
-import json
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 from datetime import datetime
 import openai
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# MlflowClient instances shared per tracking URI
+_clients: Dict[str, mlflow.tracking.MlflowClient] = {}
+
 class OpenWebUIMLflowTracker:
     """MLflow integration for Open WebUI experiments"""
     
@@ -31,16 +38,32 @@ class OpenWebUIMLflowTracker:
         os.environ['MLFLOW_S3_IGNORE_TLS_CERT'] = 'true'
         os.environ['MLFLOW_S3_VERIFY_SSL'] = 'false'
         
-        self.client = mlflow.tracking.MlflowClient()
+        if tracking_uri not in _clients:
+            _clients[tracking_uri] = mlflow.tracking.MlflowClient(tracking_uri=tracking_uri)
+        self.client = _clients[tracking_uri]
+        
+        # Experiment name -> id, resolved once per tracker
+        self._experiment_ids: Dict[str, str] = {}
+        
+        # Runs blocking tracking calls for the async wrappers below
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mlflow")
+    
+    def _eid(self, experiment_name: str, create: bool = False) -> Optional[str]:
+        """Resolve an experiment id, creating the experiment if asked"""
+        if experiment_name not in self._experiment_ids:
+            experiment = mlflow.get_experiment_by_name(experiment_name)
+            if experiment is not None:
+                self._experiment_ids[experiment_name] = experiment.experiment_id
+            elif create:
+                self._experiment_ids[experiment_name] = mlflow.create_experiment(experiment_name)
+            else:
+                return None
+        return self._experiment_ids[experiment_name]
         
     def start_experiment(self, experiment_name: str = "openwebui_chat"):
         """Start or get existing experiment"""
         try:
-            experiment = mlflow.get_experiment_by_name(experiment_name)
-            if experiment is None:
-                experiment_id = mlflow.create_experiment(experiment_name)
-            else:
-                experiment_id = experiment.experiment_id
+            experiment_id = self._eid(experiment_name, create=True)
             
             mlflow.set_experiment(experiment_name)
             return experiment_id
@@ -58,18 +81,18 @@ class OpenWebUIMLflowTracker:
         
         with mlflow.start_run():
             # Log parameters
-            mlflow.log_param("model", model)
-            mlflow.log_param("num_messages", len(messages))
-            mlflow.log_param("session_id", datetime.now().isoformat())
+            mlflow.log_params({
+                "model": model,
+                "num_messages": len(messages),
+                "session_id": datetime.now().isoformat()
+            })
             
             # Log metrics
-            for key, value in metrics.items():
-                mlflow.log_metric(key, value)
+            mlflow.log_metrics(metrics)
             
             # Log tags
             if tags:
-                for key, value in tags.items():
-                    mlflow.set_tag(key, value)
+                mlflow.set_tags(tags)
             
             # Log the conversation as artifact
             conversation_data = {
@@ -80,13 +103,8 @@ class OpenWebUIMLflowTracker:
                 "metrics": metrics
             }
             
-            with open("conversation.json", "w") as f:
-                json.dump(conversation_data, f, indent=2)
-            
-            mlflow.log_artifact("conversation.json")
-            
-            # Clean up
-            os.remove("conversation.json")
+            # Upload straight from memory; no temp file to write and clean up
+            mlflow.log_dict(conversation_data, "conversation.json")
             
             logger.info(f"Tracked chat session with run_id: {mlflow.active_run().info.run_id}")
     
@@ -102,12 +120,10 @@ class OpenWebUIMLflowTracker:
             
             # Log hyperparameters
             if hyperparameters:
-                for key, value in hyperparameters.items():
-                    mlflow.log_param(key, value)
+                mlflow.log_params(hyperparameters)
             
             # Log performance metrics
-            for key, value in performance_metrics.items():
-                mlflow.log_metric(key, value)
+            mlflow.log_metrics(performance_metrics)
             
             # Log model as artifact
             mlflow.log_artifact(f"models/{model_name}")
@@ -123,27 +139,50 @@ class OpenWebUIMLflowTracker:
         
         with mlflow.start_run():
             # Log API usage parameters
-            mlflow.log_param("api_calls", api_calls)
-            mlflow.log_param("total_tokens", total_tokens)
+            mlflow.log_params({"api_calls": api_calls, "total_tokens": total_tokens})
             
             # Log metrics
-            mlflow.log_metric("total_cost", cost)
-            mlflow.log_metric("avg_response_time", sum(response_times) / len(response_times))
-            mlflow.log_metric("max_response_time", max(response_times))
-            mlflow.log_metric("min_response_time", min(response_times))
+            times = np.asarray(response_times, dtype=np.float64)
+            usage_metrics = {
+                "total_cost": cost,
+                "avg_response_time": float(times.mean()),
+                "max_response_time": float(times.max()),
+                "min_response_time": float(times.min()),
+                "p99_response_time": float(np.quantile(times, 0.99))
+            }
             
             # Log cost per token
             if total_tokens > 0:
-                mlflow.log_metric("cost_per_token", cost / total_tokens)
+                usage_metrics["cost_per_token"] = cost / total_tokens
+            
+            mlflow.log_metrics(usage_metrics)
             
             logger.info(f"Tracked API usage with run_id: {mlflow.active_run().info.run_id}")
     
+    async def atrack_chat_session(self, *args, **kwargs):
+        """Async track_chat_session; runs in the tracker's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.track_chat_session, *args, **kwargs)
+        )
+    
+    async def atrack_api_usage(self, *args, **kwargs):
+        """Async track_api_usage; runs in the tracker's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self.track_api_usage, *args, **kwargs)
+        )
+    
+    def close(self):
+        """Wait for pending async tracking calls and stop the thread pool"""
+        self._executor.shutdown(wait=True)
+    
     def get_experiment_history(self, experiment_name: str = "openwebui_chat"):
         """Get experiment history"""
         try:
-            experiment = mlflow.get_experiment_by_name(experiment_name)
-            if experiment:
-                runs = mlflow.search_runs(experiment.experiment_id)
+            experiment_id = self._eid(experiment_name)
+            if experiment_id:
+                runs = mlflow.search_runs(experiment_id)
                 return runs
             return None
         except Exception as e:
@@ -153,32 +192,27 @@ class OpenWebUIMLflowTracker:
     def compare_models(self, experiment_name: str = "openwebui_chat"):
         """Compare different models performance"""
         try:
-            experiment = mlflow.get_experiment_by_name(experiment_name)
-            if experiment:
+            experiment_id = self._eid(experiment_name)
+            if experiment_id:
                 runs = mlflow.search_runs(
-                    experiment.experiment_id,
+                    experiment_id,
                     filter_string="metrics.response_time < 5.0"  # Example filter
                 )
+                if runs.empty:
+                    return {}
                 
                 # Group by model and calculate averages
-                model_performance = {}
-                for _, run in runs.iterrows():
-                    model = run.params.get("model", "unknown")
-                    if model not in model_performance:
-                        model_performance[model] = {
-                            "response_times": [],
-                            "costs": [],
-                            "run_count": 0
-                        }
-                    
-                    if "response_time" in run.metrics:
-                        model_performance[model]["response_times"].append(run.metrics["response_time"])
-                    if "cost" in run.metrics:
-                        model_performance[model]["costs"].append(run.metrics["cost"])
-                    
-                    model_performance[model]["run_count"] += 1
+                aggregations = {
+                    "avg_response_time": ("metrics.response_time", "mean"),
+                    "max_response_time": ("metrics.response_time", "max"),
+                    "run_count": ("metrics.response_time", "size")
+                }
+                # search_runs only returns columns that some run actually logged
+                if "metrics.cost" in runs.columns:
+                    aggregations["avg_cost"] = ("metrics.cost", "mean")
                 
-                return model_performance
+                models = runs.get("params.model", pd.Series("unknown", index=runs.index)).fillna("unknown")
+                return runs.groupby(models).agg(**aggregations).to_dict("index")
             return None
         except Exception as e:
             logger.error(f"Error comparing models: {e}")
@@ -3,7 +3,7 @@
 Startup script for OpenWebUI FastAPI application
 """
 import uvicorn
-from main import app
+from main import app, UVICORN_LOOP
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -11,5 +11,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop=UVICORN_LOOP,
+        http="httptools",
         log_level="info"
     )
@@ -3,20 +3,48 @@
 Docker setup script for Open WebUI
 """
 import os
+import shutil
 import subprocess
 import sys
 
+# Resolve the docker executable once instead of searching PATH on every call
+DOCKER = shutil.which("docker") or "docker"
+
+_ENV_TEMPLATE = """\
+# OpenAI API Configuration
+OPENAI_API_KEY=your_actual_openai_api_key_here
+
+# Open WebUI Configuration
+WEBUI_SECRET_KEY=your_secret_key_for_webui_access
+
+# Monitoring Configuration
+GRAFANA_PASSWORD=admin
+
+# MLflow Configuration
+MLFLOW_TRACKING_URI=http://localhost:5001
+MINIO_ACCESS_KEY=minioadmin
+MINIO_SECRET_KEY=minioadmin
+
+# Optional: Customize these if needed
+# DEFAULT_USER_ROLE=admin
+# DEFAULT_MODELS=gpt-4o-mini,gpt-4o,gpt-4-turbo,gpt-3.5-turbo
+# DEFAULT_MODEL=gpt-4o-mini
+"""
+
 def run_command(command, description):
-    """Run a command and handle errors"""
+    """Run a command (argv list) and handle errors"""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} failed: {e}")
         print(f"Error output: {e.stderr}")
         return False
+    except OSError as e:
+        print(f"❌ {description} failed: {e}")
+        return False
 
 def create_env_file():
     """Create .env file if it doesn't exist"""
@@ -25,20 +53,7 @@ def create_env_file():
         print("📝 Creating .env file...")
         try:
             with open(env_file, "w") as f:
-                f.write("# OpenAI API Configuration\n")
-                f.write("OPENAI_API_KEY=your_actual_openai_api_key_here\n\n")
-                f.write("# Open WebUI Configuration\n")
-                f.write("WEBUI_SECRET_KEY=your_secret_key_for_webui_access\n\n")
-                f.write("# Monitoring Configuration\n")
-                f.write("GRAFANA_PASSWORD=admin\n\n")
-                f.write("# MLflow Configuration\n")
-                f.write("MLFLOW_TRACKING_URI=http://localhost:5001\n")
-                f.write("MINIO_ACCESS_KEY=minioadmin\n")
-                f.write("MINIO_SECRET_KEY=minioadmin\n\n")
-                f.write("# Optional: Customize these if needed\n")
-                f.write("# DEFAULT_USER_ROLE=admin\n")
-                f.write("# DEFAULT_MODELS=gpt-4o-mini,gpt-4o,gpt-4-turbo,gpt-3.5-turbo\n")
-                f.write("# DEFAULT_MODEL=gpt-4o-mini\n")
+                f.write(_ENV_TEMPLATE)
             print("✅ .env file created successfully")
             print("⚠️  Please edit .env and add your actual OpenAI API key")
             return True
@@ -53,7 +68,7 @@ def check_docker():
     """Check if Docker is running"""
     print("🔍 Checking Docker status...")
     try:
-        result = subprocess.run("docker info", shell=True, capture_output=True, text=True)
+        result = subprocess.run([DOCKER, "info"], capture_output=True, text=True)
         if result.returncode == 0:
             print("✅ Docker is running")
             return True
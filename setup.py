@@ -1,75 +1,112 @@
 #!/usr/bin/env python3
 """
 Setup script for OpenWebUI FastAPI application
+
+Dependencies are declared in pyproject.toml and installed with
+`python -m pip install .`; running this script bootstraps the .env file.
+Pass --force to regenerate an existing .env from the template.
 """
 import os
-import subprocess
 import sys
 
-def run_command(command, description):
-    """Run a command and handle errors"""
-    print(f"🔄 {description}...")
+_ENV_TEMPLATE = b"""\
+# OpenAI API Configuration
+OPENAI_API_KEY=your_openai_api_key_here
+
+# Server Configuration (optional)
+HOST=0.0.0.0
+PORT=8000
+
+# Logging (optional)
+LOG_LEVEL=INFO
+"""
+
+def write_env_file(env_file=".env"):
+    """Write .env via a temp file and rename, so it is never half-written"""
+    tmp_file = env_file + ".tmp"
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed: {e}")
-        print(f"Error output: {e.stderr}")
-        return False
+        os.write(fd, _ENV_TEMPLATE)
+    finally:
+        os.close(fd)
+    os.replace(tmp_file, env_file)
 
-def create_env_file():
-    """Create .env file if it doesn't exist"""
+def create_env_file(force=False):
+    """Create .env file if it doesn't exist (or always, with force)"""
     env_file = ".env"
-    if not os.path.exists(env_file):
-        print("📝 Creating .env file...")
+    if force:
         try:
-            with open(env_file, "w") as f:
-                f.write("# OpenAI API Configuration\n")
-                f.write("OPENAI_API_KEY=your_openai_api_key_here\n\n")
-                f.write("# Server Configuration (optional)\n")
-                f.write("HOST=0.0.0.0\n")
-                f.write("PORT=8000\n\n")
-                f.write("# Logging (optional)\n")
-                f.write("LOG_LEVEL=INFO\n")
-            print("✅ .env file created successfully")
-            print("⚠️  Please edit .env and add your actual OpenAI API key")
-            return True
+            write_env_file(env_file)
         except Exception as e:
             print(f"❌ Failed to create .env file: {e}")
             return False
-    else:
+        print("📝 Regenerated .env file from template\n"
+              "⚠️  Please edit .env and add your actual OpenAI API key")
+        return True
+    
+    try:
+        # "xb" fails if the file exists (O_EXCL); unbuffered binary mode sends
+        # the template in one write with no text encoding step
+        with open(env_file, "xb", buffering=0,
+                  opener=lambda path, flags: os.open(path, flags, 0o600)) as f:
+            f.write(_ENV_TEMPLATE)
+    except FileExistsError:
         print("✅ .env file already exists")
         return True
+    except Exception as e:
+        print(f"❌ Failed to create .env file: {e}")
+        return False
+    
+    print("📝 Creating .env file...\n"
+          "✅ .env file created successfully\n"
+          "⚠️  Please edit .env and add your actual OpenAI API key")
+    return True
+
+def _in_build_backend():
+    """True when pip (or another PEP 517 frontend) is building this project"""
+    return any(var in os.environ for var in (
+        "PIP_BUILD_TRACKER",
+        "PEP517_BUILD_BACKEND",            # pyproject_hooks < 1.1
+        "_PYPROJECT_HOOKS_BUILD_BACKEND",  # pyproject_hooks >= 1.1
+    ))
 
-def main():
+def main(force=False):
     """Main setup function"""
-    print("🚀 OpenWebUI FastAPI Setup")
-    print("=" * 40)
+    # Nothing to bootstrap while pip is only building/inspecting the project
+    if _in_build_backend():
+        return
     
     # Check Python version
     if sys.version_info < (3, 8):
         print("❌ Python 3.8+ is required")
         sys.exit(1)
     
-    print(f"✅ Python {sys.version_info.major}.{sys.version_info.minor} detected")
-    
-    # Install dependencies
-    if not run_command("pip install -r requirements.txt", "Installing Python dependencies"):
-        print("❌ Setup failed. Please check the error messages above.")
-        sys.exit(1)
+    # Banner and version check go out as one write
+    print("🚀 OpenWebUI FastAPI Setup\n"
+          f"{'=' * 40}\n"
+          f"✅ Python {sys.version_info.major}.{sys.version_info.minor} detected")
     
     # Create .env file
-    if not create_env_file():
+    if not create_env_file(force=force):
         print("❌ Setup failed. Please check the error messages above.")
         sys.exit(1)
     
-    print("\n🎉 Setup completed successfully!")
-    print("\n📋 Next steps:")
-    print("1. Edit .env file and add your OpenAI API key")
-    print("2. Run: python run.py")
-    print("3. Open http://localhost:8000 in your browser")
-    print("\n💡 For help, see INSTALL.md")
+    # Name this interpreter so dependencies land in the environment that
+    # will run the app, not whatever `pip` is first on PATH
+    print("\n🎉 Setup completed successfully!\n"
+          "\n📋 Next steps:\n"
+          f"1. Install dependencies (if not done yet): {sys.executable} -m pip install .\n"
+          "2. Edit .env file and add your OpenAI API key\n"
+          "3. Run: python run.py\n"
+          "4. Open http://localhost:8000 in your browser\n"
+          "\n💡 For help, see INSTALL.md")
 
 if __name__ == "__main__":
-    main()
+    # setuptools' build backend runs this file with a command such as
+    # egg_info or bdist_wheel; hand those to setuptools (config lives in
+    # pyproject.toml) and keep the interactive setup for a bare run
+    if any(arg != "--force" for arg in sys.argv[1:]):
+        from setuptools import setup
+        setup()
+    else:
+        main(force="--force" in sys.argv[1:])
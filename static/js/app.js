@@ -206,6 +206,9 @@ class OpenWebUI {
     // WebSocket support for real-time chat (optional)
     initializeWebSocket() {
         this.ws = new WebSocket(`ws://${window.location.host}/ws/chat`);
+        // Responses arrive as UTF-8 binary frames
+        this.ws.binaryType = 'arraybuffer';
+        this.textDecoder = new TextDecoder('utf-8');
         
         this.ws.onopen = () => {
             console.log('WebSocket connected');
@@ -213,7 +216,10 @@ class OpenWebUI {
         
         this.ws.onmessage = (event) => {
             // Handle streaming responses
-            console.log('WebSocket message:', event.data);
+            const text = typeof event.data === 'string'
+                ? event.data
+                : this.textDecoder.decode(event.data);
+            console.log('WebSocket message:', text);
         };
         
         this.ws.onclose = () => {